@@ -1,7 +1,8 @@
 import sqlite3
+import os
 
 # Database file path, ensure this matches the path used in your Flask application
-DATABASE = '/nfs/employees.db'
+DATABASE = os.environ.get('DATABASE_PATH', '/var/lib/app/employees.db')
 
 def connect_db():
     """Connect to the SQLite database."""
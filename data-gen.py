@@ -2,7 +2,7 @@ import sqlite3
 import os
 import random
 
-DATABASE = '/nfs/employees.db'
+DATABASE = os.environ.get('DATABASE_PATH', '/var/lib/app/employees.db')
 
 def connect_db():
     return sqlite3.connect(DATABASE)
@@ -1,113 +1,393 @@
-from flask import Flask, request, render_template, redirect, url_for, flash
+from flask import Flask, request, stream_template, redirect, url_for, flash, get_flashed_messages, session, jsonify, g
 import sqlite3
 import os
-import math
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import re
+from collections import namedtuple
+import functools
+import threading
+import queue
+import atexit
+import shutil
+import time
+import signal
+import sys
+from contextlib import contextmanager
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret")
 
-# Path to DB (keep same as you used)
-DATABASE = '/nfs/employees.db'
+# The live DB sits on local disk; NFS only receives periodic snapshots (see backup_db)
+DATABASE = os.environ.get('DATABASE_PATH', '/var/lib/app/employees.db')
+BACKUP_PATH = os.environ.get('BACKUP_PATH', '/nfs/employees.db.backup')
+BACKUP_INTERVAL = int(os.environ.get('BACKUP_INTERVAL', 300))  # seconds
+# Where the live DB lived before it moved to local disk; seeds the first start if no snapshot exists yet
+LEGACY_DATABASE_PATH = os.environ.get('LEGACY_DATABASE_PATH', '/nfs/employees.db')
 PER_PAGE_DEFAULT = 10
+# ?per= is user-controlled; cap it so one request can't pull the whole table
+PER_PAGE_MAX = 200
 EASTERN = ZoneInfo("America/New_York")
 
 # -----------------------
-# Validation Functions
+# SQL statements (module constants so sqlite3's per-connection statement cache keeps them prepared)
 # -----------------------
-def validate_employee(employee_id, name, phone, hourly_rate):
-    errors = []
-
-    # Employee ID must be integer (non-empty)
-    if not (isinstance(employee_id, str) and employee_id.isdigit()):
-        errors.append("Employee ID must be an integer.")
+SQL_COUNT = 'SELECT COUNT(*) as c FROM employees'
+# One query for the page, its total hours (treat NULL as 0) and the table's row count.
+# The inner subquery paginates first so only this page's rows get aggregated.
+# Column order matches the Employee namedtuple below.
+_SQL_LIST_TEMPLATE = '''
+    SELECT e.id, e.employee_id, e.name, e.phone, e.hourly_rate,
+           COALESCE(SUM(t.hours_worked), 0) AS total_hours, e.total_count
+    FROM ({page}) e
+    LEFT JOIN time_logs t ON t.employee_id = e.employee_id
+    GROUP BY e.id
+    ORDER BY e.id DESC
+'''
+# Page by number: COUNT(*) OVER() is evaluated before LIMIT, so total_count covers every employee.
+SQL_LIST_PAGE = _SQL_LIST_TEMPLATE.format(page='''
+    SELECT id, employee_id, name, phone, hourly_rate, COUNT(*) OVER() AS total_count
+    FROM employees ORDER BY id DESC LIMIT ? OFFSET ?''')
+# Page after a known id (keyset): seeks on the primary key instead of scanning past OFFSET rows.
+SQL_LIST_AFTER = _SQL_LIST_TEMPLATE.format(page='''
+    SELECT id, employee_id, name, phone, hourly_rate, (SELECT COUNT(*) FROM employees) AS total_count
+    FROM employees WHERE id < ? ORDER BY id DESC LIMIT ?''')
+Employee = namedtuple('Employee', 'id employee_id name phone hourly_rate total_hours total_count')
+SQL_INSERT_EMPLOYEE = 'INSERT INTO employees (employee_id, name, phone, hourly_rate) VALUES (?, ?, ?, ?)'
+SQL_UPDATE_EMPLOYEE = 'UPDATE employees SET employee_id=?, name=?, phone=?, hourly_rate=? WHERE id=?'
+# time_logs rows go with the employee via ON DELETE CASCADE (foreign_keys is ON per connection)
+SQL_DELETE_EMPLOYEE = 'DELETE FROM employees WHERE id = ?'
+# Drop the employee's closed shifts; an open clock-in survives so it can still be clocked out
+SQL_RESET_HOURS = 'DELETE FROM time_logs WHERE employee_id=? AND clock_out IS NOT NULL'
+SQL_EMPLOYEE_EXISTS = 'SELECT 1 FROM employees WHERE employee_id = ?'
+SQL_CLOCK_IN = 'INSERT INTO time_logs (employee_id, clock_in) VALUES (?, ?)'
+# Close the employee's most recent open clock-in and compute the hours in SQLite
+# (timestamps are Unix seconds).
+SQL_CLOCK_OUT = '''
+    UPDATE time_logs
+    SET clock_out = ?1, hours_worked = round((?1 - clock_in) / 3600.0, 2)
+    WHERE id = (SELECT id FROM time_logs WHERE employee_id = ?2 AND clock_out IS NULL ORDER BY id DESC LIMIT 1)
+    RETURNING hours_worked
+'''
 
+# -----------------------
+# Validation Functions
+# -----------------------
+_NAME_RE = re.compile(r"[A-Za-z ]+")
+# Non-negative decimal with at most 2 places and no leading zeros, checked in one pass
+_RATE_RE = re.compile(r"(?:0|[1-9][0-9]*)(?:\.[0-9]{1,2})?")
+
+def is_ascii_digits(value):
+    # Same as [0-9]+ but cheaper than a regex: isascii() is O(1) on CPython strings and
+    # isdigit() then takes the ASCII fast path (isdigit() alone also accepts e.g. '²', which int() rejects)
+    return value.isascii() and value.isdigit()
+
+# Largest value sqlite3 can bind as an INTEGER; bigger ints raise OverflowError at execute()
+SQLITE_INT_MAX = 2**63 - 1
+SQLITE_INT_MAX_DIGITS = len(str(SQLITE_INT_MAX))  # 19
+
+def is_sqlite_int(value):
+    # ASCII digits whose value still fits in a SQLite INTEGER. The length check comes first so
+    # int() never sees huge input (it raises ValueError past 4300 digits, and is slow before that).
+    return (is_ascii_digits(value) and len(value) <= SQLITE_INT_MAX_DIGITS
+            and int(value) <= SQLITE_INT_MAX)
+
+# One (check, message) pair per validate_employee argument, in argument order
+_VALIDATORS = (
+    # Employee ID must be integer (non-empty) and fit in a SQLite INTEGER
+    (is_sqlite_int, "Employee ID must be an integer."),
     # Name must contain only letters and spaces
-    if not (isinstance(name, str) and re.fullmatch(r"[A-Za-z ]+", name)):
-        errors.append("Name must contain only letters and spaces.")
-
+    (_NAME_RE.fullmatch, "Name must contain only letters and spaces."),
     # Phone must be integer (digits only)
-    if not (isinstance(phone, str) and phone.isdigit()):
-        errors.append("Phone must contain only digits.")
+    (is_ascii_digits, "Phone must contain only digits."),
+    # Hourly rate format (databases created with the CHECK constraints also enforce it)
+    (_RATE_RE.fullmatch, "Hourly rate must be a non-negative number with at most 2 decimal places."),
+)
+
+def check_employee(employee_id, name, phone, hourly_rate):
+    # Returns a tuple so cached results (see validate_employee) can't be mutated
+    return tuple(
+        message
+        for (check, message), value in zip(_VALIDATORS, (employee_id, name, phone, hourly_rate))
+        if not (isinstance(value, str) and check(value))
+    )
 
-    # Hourly rate must be float with up to 2 decimals
-    try:
-        # Accept numeric strings like '15' or '15.5' or '15.50'
-        rate = float(hourly_rate)
-        if rate < 0:
-            errors.append("Hourly rate must be non-negative.")
-        else:
-            # check decimals (works if hourly_rate is string with decimal part)
-            parts = str(hourly_rate).split('.')
-            if len(parts) == 2 and len(parts[1]) > 2:
-                errors.append("Hourly rate can have at most 2 decimal places.")
-    except Exception:
-        errors.append("Hourly rate must be a number.")
+_check_employee_cached = functools.lru_cache(maxsize=1024)(check_employee)
+# Longer inputs skip the cache so it never pins large request values in memory
+VALIDATE_CACHE_MAX_LEN = 64
 
-    return errors
+def validate_employee(employee_id, name, phone, hourly_rate):
+    # Memoized on the raw form strings, as long as they are all short
+    args = (employee_id, name, phone, hourly_rate)
+    if all(isinstance(value, str) and len(value) <= VALIDATE_CACHE_MAX_LEN for value in args):
+        return _check_employee_cached(*args)
+    return check_employee(*args)
+
+def integrity_error_message(exc):
+    # Map a constraint failure raised by the employees table to form feedback
+    if 'UNIQUE' in str(exc):
+        return 'Employee ID must be unique.'
+    if 'FOREIGN KEY' in str(exc):
+        return 'Employee ID cannot be changed while the employee has time logs.'
+    # CHECK failures; only files created with the constraints have them (init_db doesn't add them
+    # to an existing employees table), and validate_employee has already vetted the rate format
+    return 'Employee ID must be a positive integer.'
 
 # -----------------------
-# DB helper utilities (open/close per operation)
+# DB helper utilities (process-wide connection pool)
 # -----------------------
-def open_conn():
-    # timeout increased to avoid transient locks, check_same_thread=False not strictly required
-    conn = sqlite3.connect(DATABASE, timeout=30)
+# The dev server starts a thread per request, so connections are pooled per process, not per thread
+POOL_SIZE = 8
+_pool = queue.Queue(maxsize=POOL_SIZE)
+
+def connect():
+    # timeout increased to avoid transient locks; check_same_thread=False because a pooled
+    # connection is handed to whichever request thread borrows it next (one at a time)
+    # cached_statements sized to hold every distinct SQL string this module runs
+    conn = sqlite3.connect(DATABASE, timeout=30, check_same_thread=False, cached_statements=128)
     conn.row_factory = sqlite3.Row
     # Helpful to enforce foreign keys if you rely on them
     conn.execute("PRAGMA foreign_keys = ON;")
+    # Per-connection tuning; journal_mode=WAL is persisted in the file by init_db().
+    # The connect() timeout above already acts as the busy timeout for contending writers.
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    # 64 MiB page cache (an upper bound, allocated as pages are read); pooled connections
+    # are reused across requests and threads, so a warm cache serves later requests too
+    conn.execute("PRAGMA cache_size = -65536;")
     return conn
 
+def open_conn():
+    # One connection per app context, borrowed from the pool so connect() and the PRAGMA
+    # setup only run when the pool is empty; release_conn() hands it back
+    if 'db' not in g:
+        try:
+            g.db = _pool.get_nowait()
+        except queue.Empty:
+            g.db = connect()
+    return g.db
+
+@atexit.register
+def checkpoint_wal():
+    # Fold the WAL back into the main file on shutdown so no -wal file is left behind
+    if not os.path.exists(DATABASE):
+        return
+    try:
+        conn = sqlite3.connect(DATABASE, timeout=30)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+def return_conn(conn):
+    # never let a pooled connection carry an uncommitted transaction into the next request
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+@app.teardown_appcontext
+def release_conn(exc):
+    # Runs when the view returns, before a streamed body is sent; a streaming view takes its
+    # connection out of g first and returns it once the response is closed (see index)
+    conn = g.pop('db', None)
+    if conn is not None:
+        return_conn(conn)
+
 def fetchall(query, args=()):
-    conn = open_conn()
-    cur = conn.execute(query, args)
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    return open_conn().execute(query, args).fetchall()
 
 def fetchone(query, args=()):
-    conn = open_conn()
-    cur = conn.execute(query, args)
-    row = cur.fetchone()
-    conn.close()
-    return row
+    return open_conn().execute(query, args).fetchone()
 
 def execute(query, args=()):
     conn = open_conn()
-    cur = conn.execute(query, args)
-    conn.commit()
-    lastrowid = cur.lastrowid
-    conn.close()
-    return lastrowid
+    # commit on success, roll back on error so the pooled connection never keeps a dangling transaction
+    with conn:
+        cur = conn.execute(query, args)
+    invalidate_page_cache()
+    return cur.lastrowid
+
+@contextmanager
+def transaction():
+    # Run several statements as one unit on this request's connection. BEGIN IMMEDIATE takes
+    # the write lock up front so check-then-write sequences cannot interleave with another writer.
+    conn = open_conn()
+    with conn:
+        conn.execute('BEGIN IMMEDIATE')
+        yield conn
+    invalidate_page_cache()
+
+# -----------------------
+# Listing page cache (every committed write invalidates it)
+# -----------------------
+PAGE_CACHE_MAX = 128
+# Writes from outside this process (other workers, data-gen.py) don't bump the version,
+# so entries also expire after this many seconds
+PAGE_CACHE_TTL = 1.0
+_cache_lock = threading.Lock()
+_page_cache = {}
+_cache_version = 0
+# Salts listing ETags so a restarted process (version back at 0) never matches an old tag
+_ETAG_SALT = os.urandom(4).hex()
+
+def invalidate_page_cache():
+    global _cache_version
+    with _cache_lock:
+        _cache_version += 1
+        _page_cache.clear()
+
+def cache_page(key, value):
+    with _cache_lock:
+        # bounded because page/per come straight from the query string
+        if len(_page_cache) >= PAGE_CACHE_MAX:
+            _page_cache.clear()
+        _page_cache[key] = (time.monotonic() + PAGE_CACHE_TTL, value)
+
+def cached_page(key):
+    entry = _page_cache.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+def iter_page(cur, rows, first, cache_key, total):
+    # Hand rows to the template one at a time; the page is only cached once fully read
+    page_rows = [first]
+    try:
+        yield first
+        for row in rows:
+            page_rows.append(row)
+            yield row
+    finally:
+        cur.close()
+    cache_page(cache_key, (page_rows, total))
 
 # -----------------------
 # Initialize DB (with UNIQUE integer employee_id)
 # -----------------------
+# Bump when the DDL below changes; stored in the file as PRAGMA user_version
+SCHEMA_VERSION = 2
+_schema_ready = False
+
+# clock_in/clock_out hold Unix seconds (schema v2; v1 stored ISO-8601 text)
+TIME_LOGS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER NOT NULL,
+        clock_in INTEGER,
+        clock_out INTEGER,
+        hours_worked REAL,
+        FOREIGN KEY(employee_id) REFERENCES employees(employee_id) ON DELETE CASCADE
+    );
+'''
+
 def init_db():
-    with open_conn() as db:
-        # employees.employee_id stored as INTEGER and UNIQUE to enforce uniqueness at DB level.
-        # Keep employee internal id (id) as autoincrement primary key.
-        db.execute('''
-            CREATE TABLE IF NOT EXISTS employees (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                phone TEXT NOT NULL,
-                hourly_rate REAL NOT NULL
-            );
-        ''')
-        db.execute('''
-            CREATE TABLE IF NOT EXISTS time_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                clock_in TEXT,
-                clock_out TEXT,
-                hours_worked REAL,
-                FOREIGN KEY(employee_id) REFERENCES employees(employee_id) ON DELETE CASCADE
-            );
-        ''')
-        db.commit()
+    global _schema_ready
+    if _schema_ready:
+        return
+    db = open_conn()
+    # WAL lets readers run alongside a writer; the mode sticks to the DB file. Set it on every
+    # start (a no-op once set): a file restored from a VACUUM INTO snapshot is back in rollback
+    # mode even though it is already at SCHEMA_VERSION. (It can't change inside a transaction.)
+    db.execute("PRAGMA journal_mode = WAL;")
+    # A file already at SCHEMA_VERSION skips the DDL and the write lock it would take
+    if db.execute("PRAGMA user_version;").fetchone()[0] < SCHEMA_VERSION:
+        with transaction() as db:
+            # employees.employee_id stored as INTEGER and UNIQUE to enforce uniqueness at DB level.
+            # Keep employee internal id (id) as autoincrement primary key.
+            # The CHECK constraints only apply to newly created files; no migration rebuilds an existing table.
+            db.execute('''
+                CREATE TABLE IF NOT EXISTS employees (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    employee_id INTEGER UNIQUE NOT NULL CHECK(employee_id > 0),
+                    name TEXT NOT NULL,
+                    phone TEXT NOT NULL,
+                    hourly_rate REAL NOT NULL CHECK(hourly_rate >= 0 AND hourly_rate = round(hourly_rate, 2))
+                );
+            ''')
+            clock_in_type = db.execute("SELECT type FROM pragma_table_info('time_logs') WHERE name = 'clock_in'").fetchone()
+            if clock_in_type and clock_in_type[0] == 'TEXT':
+                # v1 -> v2: rebuild time_logs with INTEGER timestamps (TEXT affinity would
+                # turn stored integers back into strings); strftime('%s') honours the UTC offset
+                db.execute(TIME_LOGS_DDL.format(table='time_logs_v2'))
+                db.execute('''
+                    INSERT INTO time_logs_v2 (id, employee_id, clock_in, clock_out, hours_worked)
+                    SELECT id, employee_id, CAST(strftime('%s', clock_in) AS INTEGER),
+                           CAST(strftime('%s', clock_out) AS INTEGER), hours_worked
+                    FROM time_logs
+                ''')
+                db.execute('DROP TABLE time_logs')
+                db.execute('ALTER TABLE time_logs_v2 RENAME TO time_logs')
+            db.execute(TIME_LOGS_DDL.format(table='time_logs'))
+            # Covering index so per-employee SUM(hours_worked) is an index-only range scan
+            db.execute("CREATE INDEX IF NOT EXISTS idx_time_logs_emp ON time_logs(employee_id, hours_worked);")
+            # Partial index for the clock-out lookup of an employee's latest open clock-in
+            db.execute("CREATE INDEX IF NOT EXISTS idx_time_logs_emp_open ON time_logs(employee_id, id) WHERE clock_out IS NULL;")
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+    _schema_ready = True
+
+# -----------------------
+# NFS snapshots of the local DB
+# -----------------------
+def restore_db():
+    # Local disk doesn't survive a pod restart, so seed a missing DB from the last snapshot.
+    # Both copies go to a temp name first: a crash mid-copy must not leave a partial DATABASE
+    # that every later start would take as the live file.
+    os.makedirs(os.path.dirname(DATABASE), exist_ok=True)
+    if os.path.exists(DATABASE):
+        return
+    tmp_path = DATABASE + '.tmp'
+    if os.path.exists(BACKUP_PATH):
+        shutil.copyfile(BACKUP_PATH, tmp_path)
+        os.replace(tmp_path, DATABASE)
+    elif os.path.exists(LEGACY_DATABASE_PATH):
+        # First start after the move off NFS: carry the old live DB over. The backup API
+        # takes a consistent copy even if a pod on the previous build is still writing to it.
+        src = sqlite3.connect(LEGACY_DATABASE_PATH, timeout=30)
+        dst = sqlite3.connect(tmp_path)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        os.replace(tmp_path, DATABASE)
+
+def backup_db():
+    # VACUUM INTO won't overwrite an existing file, so snapshot to a temp name and swap it in.
+    # The deployments use the Recreate strategy, so only one pod ever writes BACKUP_PATH; the
+    # name is per process because the reloader parent and child may both take a snapshot.
+    tmp_path = f'{BACKUP_PATH}.{os.getpid()}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(DATABASE, timeout=30)
+    try:
+        conn.execute('VACUUM INTO ?', (tmp_path,))
+    finally:
+        conn.close()
+    os.replace(tmp_path, BACKUP_PATH)
+
+def try_backup():
+    try:
+        backup_db()
+    except (sqlite3.Error, OSError):
+        app.logger.exception('Database backup to %s failed', BACKUP_PATH)
+
+def start_backup_thread():
+    def run():
+        while True:
+            time.sleep(BACKUP_INTERVAL)
+            try_backup()
+    threading.Thread(target=run, name='db-backup', daemon=True).start()
+
+def backup_on_shutdown():
+    # Kubernetes stops the pod with SIGTERM, whose default action skips atexit; exit normally
+    # instead so a final snapshot keeps the writes made since the last interval.
+    # (Werkzeug's reloader installs the same SIGTERM handler in both of its processes.)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    atexit.register(try_backup)
 
 # -----------------------
 # Routes
@@ -120,14 +400,10 @@ def index():
         # ----------------- DELETE EMPLOYEE -----------------
         if action == 'delete':
             emp_row_id = request.form.get('id')
-            if emp_row_id and emp_row_id.isdigit():
-                # fetch the employee_id value so we can remove time_logs correctly
-                emp = fetchone('SELECT employee_id FROM employees WHERE id = ?', (emp_row_id,))
-                if emp:
-                    employee_id_val = emp['employee_id']
-                    # Delete time_logs for that employee_id and then employee row
-                    execute('DELETE FROM time_logs WHERE employee_id = ?', (employee_id_val,))
-                    execute('DELETE FROM employees WHERE id = ?', (emp_row_id,))
+            if emp_row_id and is_ascii_digits(emp_row_id):
+                with transaction() as db:
+                    deleted = db.execute(SQL_DELETE_EMPLOYEE, (emp_row_id,)).rowcount
+                if deleted:
                     flash('Employee deleted successfully.', 'success')
                 else:
                     flash('Employee not found.', 'danger')
@@ -143,7 +419,7 @@ def index():
             phone = request.form.get('phone', '').strip()
             hourly_rate = request.form.get('hourly_rate', '').strip()
 
-            if not (emp_row_id and emp_row_id.isdigit() and employee_id and name and phone and hourly_rate):
+            if not (emp_row_id and is_ascii_digits(emp_row_id) and employee_id and name and phone and hourly_rate):
                 flash('Missing fields for update.', 'danger')
                 return redirect(url_for('index'))
 
@@ -152,25 +428,20 @@ def index():
                 flash(" | ".join(errors), "danger")
                 return redirect(url_for('index'))
 
-            # convert and round
+            # convert; validate_employee has already checked the rate format
             employee_id_int = int(employee_id)
-            hourly_rate_val = round(float(hourly_rate), 2)
-
-            # Ensure uniqueness: check if another row has same employee_id
-            existing = fetchone('SELECT id FROM employees WHERE employee_id = ? AND id != ?', (employee_id_int, emp_row_id))
-            if existing:
-                flash('Another employee with that Employee ID already exists.', 'danger')
-                return redirect(url_for('index'))
+            hourly_rate_val = float(hourly_rate)
 
             try:
-                execute('''
-                    UPDATE employees
-                    SET employee_id=?, name=?, phone=?, hourly_rate=?
-                    WHERE id=?
-                ''', (employee_id_int, name, phone, hourly_rate_val, emp_row_id))
-                flash('Employee updated successfully.', 'success')
-            except sqlite3.IntegrityError:
-                flash('Employee ID must be unique.', 'danger')
+                # the UNIQUE constraint rejects an Employee ID already used by another row
+                with transaction() as db:
+                    updated = db.execute(SQL_UPDATE_EMPLOYEE, (employee_id_int, name, phone, hourly_rate_val, emp_row_id)).rowcount
+                if updated:
+                    flash('Employee updated successfully.', 'success')
+                else:
+                    flash('Employee not found.', 'danger')
+            except sqlite3.IntegrityError as e:
+                flash(integrity_error_message(e), 'danger')
             return redirect(url_for('index'))
 
         # ----------------- ADD EMPLOYEE -----------------
@@ -189,24 +460,16 @@ def index():
             flash(" | ".join(errors), "danger")
             return redirect(url_for('index'))
 
-        # convert types
+        # convert types; validate_employee has already checked the rate format
         employee_id_int = int(employee_id)
-        hourly_rate_val = round(float(hourly_rate), 2)
-
-        # check uniqueness before attempting insert to provide nicer message
-        if fetchone('SELECT 1 FROM employees WHERE employee_id = ?', (employee_id_int,)):
-            flash('Employee ID already exists.', 'danger')
-            return redirect(url_for('index'))
+        hourly_rate_val = float(hourly_rate)
 
+        # the UNIQUE constraint on employee_id rejects duplicates; no pre-check SELECT needed
         try:
-            execute('''
-                INSERT INTO employees (employee_id, name, phone, hourly_rate)
-                VALUES (?, ?, ?, ?)
-            ''', (employee_id_int, name, phone, hourly_rate_val))
+            execute(SQL_INSERT_EMPLOYEE, (employee_id_int, name, phone, hourly_rate_val))
             flash('Employee added successfully.', 'success')
-        except sqlite3.IntegrityError:
-            # fallback if race condition creates duplicate
-            flash('Employee ID must be unique.', 'danger')
+        except sqlite3.IntegrityError as e:
+            flash(integrity_error_message(e), 'danger')
         return redirect(url_for('index'))
 
     # ----------------- GET EMPLOYEES -----------------
@@ -215,42 +478,80 @@ def index():
     except ValueError:
         page = 1
     try:
-        per_page = max(int(request.args.get('per', PER_PAGE_DEFAULT)), 1)
+        per_page = min(max(int(request.args.get('per', PER_PAGE_DEFAULT)), 1), PER_PAGE_MAX)
     except ValueError:
         per_page = PER_PAGE_DEFAULT
     offset = (page - 1) * per_page
-
-    total_row = fetchone('SELECT COUNT(*) as c FROM employees')
-    total = total_row['c'] if total_row else 0
-
-    employees = fetchall(
-        'SELECT * FROM employees ORDER BY id DESC LIMIT ? OFFSET ?',
-        (per_page, offset)
-    )
-
-    employees_with_hours = []
-    for emp in employees:
-        # Sum of hours_worked (treat NULL as 0)
-        total_hours_row = fetchone('SELECT SUM(hours_worked) AS s FROM time_logs WHERE employee_id = ?', (emp['employee_id'],))
-        total_hours = total_hours_row['s'] if total_hours_row and total_hours_row['s'] is not None else 0
-        emp_dict = dict(emp)
-        emp_dict['total_hours'] = round(float(total_hours), 2)
-        emp_dict['hourly_rate'] = round(float(emp_dict['hourly_rate']), 2)
-        employees_with_hours.append(emp_dict)
-
-    pages = max(1, math.ceil(total / per_page)) if per_page else 1
+    # "Next" links carry the last id shown so sequential paging can seek instead of OFFSET;
+    # page-number jumps (and page 1) don't have one and fall back to OFFSET.
+    after_id = request.args.get('after_id', '')
+    after_id = int(after_id) if is_sqlite_int(after_id) and page > 1 else None
+
+    version = _cache_version
+    cache_key = (page, per_page, after_id, version)
+    cached = cached_page(cache_key)
+
+    # Unchanged data means identical HTML, unless a flash message is waiting to be shown.
+    # Only trust the tag while the cached page is fresh, so outside writes surface after the TTL.
+    etag = f'{_ETAG_SALT}-{version}-{page}-{per_page}-{after_id}'
+    if cached is not None and '_flashes' not in session and request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    stream_conn = None
+    if cached is not None:
+        employees, total = cached
+    else:
+        # Rows go to the template as-is; it formats hourly_rate/total_hours to 2 decimals
+        cur = open_conn().cursor()
+        # plain tuples instead of sqlite3.Row; Employee gives them C-level named fields
+        cur.row_factory = None
+        if after_id is None:
+            cur.execute(SQL_LIST_PAGE, (per_page, offset))
+        else:
+            cur.execute(SQL_LIST_AFTER, (after_id, per_page))
+        rows = map(Employee._make, cur)
+        first = next(rows, None)
+        if first is not None:
+            total = first.total_count
+            employees = iter_page(cur, rows, first, cache_key, total)
+            # the cursor is still reading, so keep the connection out of the pool until the stream ends
+            stream_conn = g.pop('db')
+        else:
+            cur.close()
+            # page past the end returns no rows to carry the count
+            total_row = fetchone(SQL_COUNT) if offset else None
+            total = total_row['c'] if total_row else 0
+            employees = []
+            cache_page(cache_key, (employees, total))
+
+    pages = max(1, -(-total // per_page))
     has_prev = page > 1
     has_next = page < pages
     start_page = max(1, page - 2)
     end_page = min(pages, page + 2)
 
-    return render_template(
+    # The session cookie is written before a streamed body is sent, so pop pending flashes now;
+    # the template's own get_flashed_messages() call then reads this request's cached copy.
+    get_flashed_messages(with_categories=True)
+
+    # Stream the page so the first HTML chunks go out while rows are still being read
+    response = app.response_class(stream_template(
         'index.html',
-        employees=employees_with_hours,
+        employees=employees,
         page=page, pages=pages, per_page=per_page,
         has_prev=has_prev, has_next=has_next, total=total,
         start_page=start_page, end_page=end_page
-    )
+    ))
+    if stream_conn is not None:
+        # close the cursor first: a stream cut short (client gone) may never reach iter_page's finally
+        response.call_on_close(cur.close)
+        response.call_on_close(functools.partial(return_conn, stream_conn))
+    response.set_etag(etag, weak=True)
+    # always revalidate, so a write shows up on the next load
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 # -----------------------
 # Clock In/Out
@@ -264,52 +565,37 @@ def clock():
         flash('Missing employee ID or action.', 'danger')
         return redirect(url_for('index'))
 
-    if not employee_id.isdigit():
+    if not is_ascii_digits(employee_id):
         flash('Invalid employee ID.', 'danger')
         return redirect(url_for('index'))
 
     employee_id_int = int(employee_id)
-    now = datetime.now(tz=EASTERN)
-
-    # ensure employee exists
-    if not fetchone('SELECT 1 FROM employees WHERE employee_id = ?', (employee_id_int,)):
-        flash('Employee not found.', 'danger')
-        return redirect(url_for('index'))
+    # stored as Unix seconds; only the flash message needs a formatted (Eastern) time
+    now_ts = int(time.time())
+    now_hms = datetime.fromtimestamp(now_ts, tz=EASTERN).strftime('%H:%M:%S')
 
+    # No existence pre-check: the time_logs foreign key rejects unknown employees on clock-in,
+    # and clock-out simply finds no open row to close.
     if action == 'clock_in':
         try:
-            execute(
-                'INSERT INTO time_logs (employee_id, clock_in) VALUES (?, ?)',
-                (employee_id_int, now.isoformat(timespec='seconds'))
-            )
-            flash(f'Employee {employee_id} clocked in at {now.strftime("%H:%M:%S")}.', 'success')
-        except Exception as e:
+            execute(SQL_CLOCK_IN, (employee_id_int, now_ts))
+            flash(f'Employee {employee_id} clocked in at {now_hms}.', 'success')
+        except sqlite3.IntegrityError:
+            flash('Employee not found.', 'danger')
+        except Exception:
             flash('Error clocking in.', 'danger')
 
     elif action == 'clock_out':
-        # find most recent clock_in row without clock_out
-        log = fetchone(
-            'SELECT * FROM time_logs WHERE employee_id=? AND clock_out IS NULL ORDER BY id DESC LIMIT 1',
-            (employee_id_int,)
-        )
-        if log:
-            # parse stored ISO. datetime.fromisoformat handles timezone offset if present.
-            clock_in_time = datetime.fromisoformat(log['clock_in'])
-            # ensure both are timezone-aware or naive consistently; our now is timezone-aware
-            if clock_in_time.tzinfo is None:
-                clock_in_time = clock_in_time.replace(tzinfo=EASTERN)
-            delta_hours = (now - clock_in_time).total_seconds() / 3600.0
-            delta_hours = round(delta_hours, 2)
-            try:
-                execute(
-                    'UPDATE time_logs SET clock_out=?, hours_worked=? WHERE id=?',
-                    (now.isoformat(timespec='seconds'), delta_hours, log['id'])
-                )
-                flash(f'Employee {employee_id} clocked out at {now.strftime("%H:%M:%S")} ({delta_hours:.2f} hours).', 'success')
-            except Exception:
-                flash('Error recording clock out.', 'danger')
-        else:
-            flash('No clock-in found to clock out.', 'danger')
+        try:
+            with transaction() as db:
+                # closes the most recent clock_in row without clock_out, if any
+                log = db.execute(SQL_CLOCK_OUT, (now_ts, employee_id_int)).fetchone()
+            if log:
+                flash(f'Employee {employee_id} clocked out at {now_hms} ({log["hours_worked"]:.2f} hours).', 'success')
+            else:
+                flash('No clock-in found to clock out.', 'danger')
+        except Exception:
+            flash('Error recording clock out.', 'danger')
 
     return redirect(url_for('index'))
 
@@ -319,27 +605,80 @@ def clock():
 @app.route('/reset_hours', methods=['POST'])
 def reset_hours():
     emp_id = request.form.get('employee_id', '').strip()
-    if not emp_id or not emp_id.isdigit():
+    if not emp_id or not is_ascii_digits(emp_id):
         flash('Missing or invalid employee ID.', 'danger')
         return redirect(url_for('index'))
 
     emp_int = int(emp_id)
-    # ensure employee exists
-    if not fetchone('SELECT 1 FROM employees WHERE employee_id = ?', (emp_int,)):
-        flash('Employee not found.', 'danger')
-        return redirect(url_for('index'))
-
     try:
-        execute('UPDATE time_logs SET hours_worked=0 WHERE employee_id=?', (emp_int,))
-        flash(f'Total hours reset for employee {emp_int}.', 'success')
+        with transaction() as db:
+            reset = db.execute(SQL_RESET_HOURS, (emp_int,)).rowcount
+            # nothing deleted is still a success (no completed shifts); only then look the employee up
+            found = reset or db.execute(SQL_EMPLOYEE_EXISTS, (emp_int,)).fetchone()
+        if found:
+            flash(f'Total hours reset for employee {emp_int}.', 'success')
+        else:
+            flash('Employee not found.', 'danger')
     except Exception:
         flash('Error resetting hours.', 'danger')
     return redirect(url_for('index'))
 
+# -----------------------
+# Bulk Add Employees
+# -----------------------
+@app.route('/bulk_add', methods=['POST'])
+def bulk_add():
+    # JSON list of {"employee_id", "name", "phone", "hourly_rate"} objects; all rows go in or none do
+    rows = request.get_json(silent=True)
+    if not isinstance(rows, list) or not rows:
+        return jsonify(error='Expected a non-empty JSON list of employees.'), 400
+
+    params = []
+    errors = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({'row': i, 'errors': ['Row must be an object.']})
+            continue
+        values = [row.get(field, '') for field in ('employee_id', 'name', 'phone', 'hourly_rate')]
+        # str() would turn null into 'None' (and true into 'True'), so only strings and numbers go through
+        if not all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in values):
+            errors.append({'row': i, 'errors': ['Fields must be strings or numbers.']})
+            continue
+        employee_id, name, phone, hourly_rate = (str(v).strip() for v in values)
+        if not (employee_id and name and phone and hourly_rate):
+            errors.append({'row': i, 'errors': ['Missing fields.']})
+            continue
+        # uncached: a batch of one-off rows would only evict the form submissions' entries
+        row_errors = check_employee(employee_id, name, phone, hourly_rate)
+        if row_errors:
+            errors.append({'row': i, 'errors': list(row_errors)})
+            continue
+        params.append((int(employee_id), name, phone, float(hourly_rate)))
+    if errors:
+        return jsonify(errors=errors), 400
+
+    # One transaction (one commit/fsync) and one prepared statement for the whole batch
+    try:
+        with transaction() as db:
+            db.executemany(SQL_INSERT_EMPLOYEE, params)
+    except sqlite3.IntegrityError as e:
+        return jsonify(error=integrity_error_message(e)), 409
+    return jsonify(added=len(params)), 201
+
 # -----------------------
 # Run App
 # -----------------------
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
-    init_db()
-    app.run(debug=True, host='0.0.0.0', port=port)
+    app.debug = True
+    restore_db()
+    # open_conn() borrows from the pool through flask.g, which needs an app context
+    with app.app_context():
+        init_db()
+    # Every process snapshots on exit: under the reloader the parent is the one Kubernetes signals
+    backup_on_shutdown()
+    # In debug the reloader runs a parent plus a serving child; only the serving process
+    # takes periodic snapshots
+    if not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_backup_thread()
+    app.run(host='0.0.0.0', port=port)